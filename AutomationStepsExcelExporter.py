@@ -7,45 +7,74 @@
 
 import os
 import json
-import pandas as pd
+import xlsxwriter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # DR: Fall back to the stdlib parser when orjson isn't installed
+    orjson = None
+
+# DR: Column order of the row tuples built by parse_script_data
+COLUMNS = ('Script Name', 'Name', 'English_Text', 'Step_Association_Value')
 
 def load_json(file_path):
     # DR: Load and parse a JSON file from the given file path
-    with open(file_path, 'r') as file:
-        return json.load(file)
+    with open(file_path, 'rb') as file:
+        raw = file.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
 
 def parse_script_data(json_data, script_name):
     # DR: Extracts specific details from JSON data for each test automation script
     actions = []
     for sequence in json_data.get('sequenceList', []):
         for scenario in sequence.get('scenarioFlowList', []):
-            if 'stepAssociation' in scenario and scenario['stepAssociation'] is not None:
-                step_association_value = scenario['stepAssociation'].get('value', None)
-                if step_association_value:
-                    actions.append({
-                        'Script Name': script_name,
-                        'Name': scenario.get('name', 'No name'),
-                        'English_Text': scenario.get('english_text', 'No English text'),
-                        'Step_Association_Value': step_association_value
-                    })
+            step_association = scenario.get('stepAssociation')
+            step_association_value = step_association.get('value', None) if step_association else None
+            if step_association_value:
+                actions.append((
+                    script_name,
+                    scenario.get('name', 'No name'),
+                    scenario.get('english_text', 'No English text'),
+                    step_association_value
+                ))
     return actions
 
+def script_name_from_filename(filename):
+    # DR: The script name is whatever follows the last "27_" marker, minus the trailing .json extension.
+    #     When the marker is missing the whole stem is used (same result as the old split(...)[-1]).
+    stem = filename[:-5]
+    _, sep, tail = stem.rpartition('27_')
+    return tail if sep else stem
+
+def _parse_one(file_path, script_name):
+    # DR: Load and parse a single JSON file; kept at module level so the process pool can pickle it
+    json_data = load_json(file_path)
+    return parse_script_data(json_data, script_name)
+
 def process_directory(directory):
-    # DR: Process all JSON files within the specified directory and compile data
+    # DR: Process all JSON files within the specified directory across worker processes and compile data
+    file_paths = []
+    script_names = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith('.json'):
+                file_paths.append(entry.path)
+                script_names.append(script_name_from_filename(entry.name))
     all_data = []
-    for filename in os.listdir(directory):
-        if filename.endswith('.json'):
-            script_name = filename.split("27_")[-1].replace('.json', '')
-            file_path = os.path.join(directory, filename)
-            json_data = load_json(file_path)
-            script_data = parse_script_data(json_data, script_name)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for script_data in executor.map(_parse_one, file_paths, script_names, chunksize=8):
             all_data.extend(script_data)
     return all_data
 
 def export_to_excel(data, output_file):
-    # DR: Exports the processed data into an Excel file
-    df = pd.DataFrame(data)
-    df.to_excel(output_file, index=False)
+    # DR: Exports the processed data into an Excel file; constant_memory mode flushes each row to disk as it is written
+    wb = xlsxwriter.Workbook(output_file, {'constant_memory': True, 'strings_to_urls': False})
+    ws = wb.add_worksheet()
+    ws.write_row(0, 0, COLUMNS)
+    for row_index, row in enumerate(data, start=1):
+        ws.write_row(row_index, 0, row)
+    wb.close()
 
 if __name__ == '__main__':
     # DR: Main execution block to handle user input and display results
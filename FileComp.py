@@ -6,16 +6,16 @@ Date: 6/13/2024
 
 Description:
 This script compares two files to determine if they are identical and retrieves their creation dates.
-It reads the files into DataFrames, compares the content, and prints the creation dates and whether
-the files are identical.
+It compares the raw bytes of the files, stopping at the first difference, and prints the creation
+dates and whether the files are identical.
 
 Usage:
 Update the 'file1_path' and 'file2_path' variables with the paths to the files you want to compare.
 """
 
 import os
+import filecmp
 from datetime import datetime
-import pandas as pd
 
 # Function to get the creation date of a file
 def get_creation_date(file_path):
@@ -40,12 +40,8 @@ file2_path = "path/to/ORSISOUT20240613_Pentaho_MA1.txt"
 file1_creation_date = get_creation_date(file1_path)
 file2_creation_date = get_creation_date(file2_path)
 
-# Read the files into DataFrames
-file1_df = pd.read_csv(file1_path, header=None, names=["ID"])
-file2_df = pd.read_csv(file2_path, header=None, names=["ID"])
-
-# Check if the files are identical
-files_identical = file1_df.equals(file2_df)
+# Check if the files are identical with a buffered byte-for-byte compare (size mismatch short-circuits)
+files_identical = filecmp.cmp(file1_path, file2_path, shallow=False)
 
 # Print the results
 print("File 1 Creation Date:", file1_creation_date)
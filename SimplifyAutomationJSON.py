@@ -6,31 +6,54 @@
 
 import json
 
-def simplify_json(file_path):
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib parser when orjson isn't installed
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Fall back to loading the whole document when ijson isn't installed
+    ijson = None
+
+def iter_steps(file_path):
     """
-    Loads a JSON file and simplifies its structure by extracting key elements from automated test steps.
+    Yields each automated test step under sequenceList[*].scenarioFlowList[*] without holding the whole
+    document in memory when ijson is available.
     
     Args:
     file_path (str): The path to the JSON file containing the test automation data.
     
-    Returns:
-    list: A list of dictionaries, each representing a simplified version of a test step.
+    Yields:
+    dict: A single raw test step.
     """
-    with open(file_path, 'r') as file:
-        data = json.load(file)
+    with open(file_path, 'rb') as file:
+        if ijson:
+            yield from ijson.items(file, 'sequenceList.item.scenarioFlowList.item', use_float=True)
+            return
+        raw = file.read()
+    data = orjson.loads(raw) if orjson else json.loads(raw)
 
-    simplified_steps = []
     for sequence in data['sequenceList']:
-        for step in sequence['scenarioFlowList']:
-            simplified_step = {
-                'name': step['name'],
-                'action': step['action_name'],
-                'selector': simplify_selector(step['action_code']),
-                'command': translate_command(step['action_code'])
-            }
-            simplified_steps.append(simplified_step)
+        yield from sequence['scenarioFlowList']
+
+def simplify_json(file_path):
+    """
+    Streams a JSON file and simplifies its structure by extracting key elements from automated test steps.
     
-    return simplified_steps
+    Args:
+    file_path (str): The path to the JSON file containing the test automation data.
+    
+    Yields:
+    dict: A simplified version of a single test step.
+    """
+    for step in iter_steps(file_path):
+        yield {
+            'name': step['name'],
+            'action': step['action_name'],
+            'selector': simplify_selector(step['action_code']),
+            'command': translate_command(step['action_code'])
+        }
 
 def simplify_selector(action_code):
     """
@@ -59,5 +82,5 @@ def translate_command(action_code):
     return "cypress_command_equivalent"
 
 # Usage
-simplified_data = simplify_json('path_to_your_json_file.json')
+simplified_data = list(simplify_json('path_to_your_json_file.json'))
 print(json.dumps(simplified_data, indent=4))
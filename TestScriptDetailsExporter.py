@@ -7,12 +7,25 @@
 
 import os
 import json
-import pandas as pd
+from openpyxl import Workbook
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # DR: Fall back to the stdlib parser when orjson isn't installed
+    orjson = None
+
+# DR: Characters Excel does not allow in sheet names
+_SHEET_TRANS = str.maketrans({c: '_' for c in '/\\*?:[]'})
+
+# DR: Column order of the action tuples built by parse_script_data
+ACTION_COLUMNS = ('action_name', 'english_text', 'action_code', 'name', 'step_association_value')
 
 def load_json(file_path):
     # DR: Load and parse a JSON file from the given file path
-    with open(file_path, 'r') as file:
-        return json.load(file)
+    with open(file_path, 'rb') as file:
+        raw = file.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
 
 def parse_script_data(json_data):
     # DR: Parses specific data from JSON concerning test automation scripts
@@ -23,39 +36,59 @@ def parse_script_data(json_data):
     actions = []
     for sequence in json_data.get('sequenceList', []):
         for scenario in sequence.get('scenarioFlowList', []):
-            action_detail = {
-                'action_name': scenario.get('action_name', 'No action name'),
-                'english_text': scenario.get('english_text', 'No English text'),
-                'action_code': scenario.get('action_code', 'No action code'),
-                'name': scenario.get('name', 'No name')
-            }
-            if action_detail['action_name'] == "Enter Text":
-                step_association = scenario.get('stepAssociation')
-                if step_association is not None:
-                    step_association_value = step_association.get('value', 'No value')
-                else:
-                    step_association_value = 'No value'
-                action_detail['step_association_value'] = step_association_value
-            actions.append(action_detail)
+            get = scenario.get  # DR: Bind the lookup once per scenario instead of once per field
+            action_name = get('action_name', 'No action name')
+            step_association_value = None
+            if action_name == "Enter Text":
+                step_association = get('stepAssociation')
+                step_association_value = step_association.get('value', 'No value') if step_association else 'No value'
+            # DR: Rows are fixed-order tuples matching ACTION_COLUMNS rather than a dict per action
+            actions.append((
+                action_name,
+                get('english_text', 'No English text'),
+                get('action_code', 'No action code'),
+                get('name', 'No name'),
+                step_association_value
+            ))
     return script_info, actions
 
 def export_to_excel(scripts_data, output_file):
     # DR: Exports collected data into an Excel file, each script data in a separate sheet
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-        for script_name, actions in scripts_data.items():
-            valid_sheet_name = script_name[:31].replace('/', '_').replace('\\', '_').replace('*', '_').replace('?', '_').replace(':', '_').replace('[', '_').replace(']', '_')
-            df = pd.DataFrame(actions)
-            df.to_excel(writer, sheet_name=valid_sheet_name, index=False)
+    # DR: A write-only workbook streams rows straight to disk instead of building a DataFrame and cell grid
+    wb = Workbook(write_only=True)
+    for script_name, actions in scripts_data.items():
+        valid_sheet_name = script_name[:31].translate(_SHEET_TRANS)
+        # DR: The step association column is only emitted for scripts that contain an "Enter Text" action
+        has_enter_text = any(action[0] == "Enter Text" for action in actions)
+        ws = wb.create_sheet(title=valid_sheet_name)
+        ws.append(ACTION_COLUMNS if has_enter_text else ACTION_COLUMNS[:-1])
+        for action in actions:
+            ws.append(action)
+        # DR: Closing a finished sheet releases its temp file; otherwise every sheet holds one open until save
+        ws.close()
+    wb.save(output_file)
+
+def _parse_one(file_path):
+    # DR: Load and parse a single JSON file; kept at module level so the process pool can pickle it
+    json_data = load_json(file_path)
+    return parse_script_data(json_data)
 
 def process_directory(directory):
-    # DR: Process all JSON files in a specified directory
+    # DR: Process all JSON files in a specified directory across worker processes
+    with os.scandir(directory) as entries:
+        file_paths = [entry.path for entry in entries if entry.name.endswith('.json')]
     scripts_data = {}
-    for filename in os.listdir(directory):
-        if filename.endswith('.json'):
-            file_path = os.path.join(directory, filename)
-            json_data = load_json(file_path)
-            script_info, actions = parse_script_data(json_data)
-            scripts_data[script_info['name']] = actions
+    # DR: Each worker's result arrives as its own copies of every string, so repeated action_name values and
+    #     action_code blobs are shared here, in the parent, through dicts that only live for this call
+    action_names = {}
+    action_codes = {}
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for script_info, actions in executor.map(_parse_one, file_paths, chunksize=8):
+            scripts_data[script_info['name']] = [
+                (action_names.setdefault(action_name, action_name), english_text,
+                 action_codes.setdefault(action_code, action_code), name, step_association_value)
+                for action_name, english_text, action_code, name, step_association_value in actions
+            ]
     return scripts_data
 
 if __name__ == '__main__':
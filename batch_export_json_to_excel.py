@@ -1,7 +1,11 @@
 import os
 import json
-import pandas as pd
-import openpyxl
+from openpyxl import Workbook
+
+try:
+    import orjson
+except ImportError:  # Without orjson the standard json module parses the same bytes (DR)
+    orjson = None
 
 # Header comment block
 # Script Name: parse_test_scripts_to_tables.py
@@ -12,10 +16,14 @@ import openpyxl
 # and exports this information into a structured Excel file. This facilitates easy
 # analysis and review of script actions and properties.
 
+# Invalid sheet-name characters and spaces, replaced with '_' in a single translate pass (DR)
+_SHEET_TRANS = str.maketrans({c: '_' for c in '/\\*?:[] '})
+
 # Function to load a JSON file and return its content (DR)
 def load_json(file_path):
-    with open(file_path, 'r') as file:
-        return json.load(file)
+    with open(file_path, 'rb') as file:
+        raw = file.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
 
 # Function to parse script data from JSON and extract relevant details (DR)
 def parse_script_data(json_data):
@@ -36,27 +44,33 @@ def parse_script_data(json_data):
 
             if action_detail['action_name'] == "Enter Text":
                 step_association = scenario.get('stepAssociation')
-                if step_association is not None:
-                    step_association_value = step_association.get('value', 'No value')
-                else:
-                    step_association_value = 'No value'
-                action_detail['step_association_value'] = step_association_value
+                action_detail['step_association_value'] = step_association.get('value', 'No value') if step_association else 'No value'
 
             actions.append(action_detail)
 
     return script_info, actions
 
 # Function to export script data to Excel, handling naming conventions for sheets and tables (DR)
+# One write-only workbook is shared by every script's sheet and serialized once by wb.save (DR)
 def export_to_excel(scripts_data, output_file):
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-        sheet_name_count = {}  # Keep track of duplicate sheet names (DR)
-        table_name_count = {}  # Keep track of duplicate table names (DR)
-        for script_name, actions in scripts_data.items():
-            base_sheet_name = script_name[:31].replace('/', '_').replace('\\', '_').replace('*', '_').replace('?', '_').replace(':', '_').replace('[', '_').replace(']', '_').replace(' ', '_')
-            sheet_name_count[base_sheet_name] = sheet_name_count.get(base_sheet_name, 0) + 1
-            sheet = writer.book.create_sheet(title=f"{base_sheet_name}_{sheet_name_count[base_sheet_name]}")
-            df = pd.DataFrame(actions)
-            df.to_excel(writer, sheet_name=sheet.name, index=False)
+    wb = Workbook(write_only=True)
+    sheet_name_count = {}  # Keep track of duplicate sheet names (DR)
+    table_name_count = {}  # Keep track of duplicate table names (DR)
+    for script_name, actions in scripts_data.items():
+        base_sheet_name = script_name[:31].translate(_SHEET_TRANS)
+        # Suffix a sheet name only when it repeats an earlier one (DR)
+        sheet_count = sheet_name_count.get(base_sheet_name, 0)
+        valid_sheet_name = f"{base_sheet_name}_{sheet_count}" if sheet_count > 0 else base_sheet_name
+        sheet_name_count[base_sheet_name] = sheet_count + 1
+        ws = wb.create_sheet(title=valid_sheet_name)
+        headers = ['action_name', 'english_text', 'action_code', 'name']
+        if any('step_association_value' in action for action in actions):
+            headers.append('step_association_value')
+        ws.append(headers)
+        for action in actions:
+            ws.append([action.get(header) for header in headers])
+        ws.close()  # Release the sheet's temp file now rather than keeping one open per sheet until save (DR)
+    wb.save(output_file)
 
 # Function to process all JSON files in a directory and collect their data (DR)
 def process_directory(directory):
@@ -10,40 +10,53 @@ Date: April 25th, 2024
 """
 
 import json
-import pandas as pd
+import xlsxwriter
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib parser when orjson isn't installed
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Fall back to loading the whole document when ijson isn't installed
+    ijson = None
+
+def iter_scenarios(input_file):
+    # Yield each scenario flow under sequenceList[*].scenarioFlowList[*]; ijson streams them one at a
+    # time so memory stays flat no matter how large the file is
+    with open(input_file, 'rb') as file:
+        if ijson:
+            yield from ijson.items(file, 'sequenceList.item.scenarioFlowList.item', use_float=True)
+            return
+        raw = file.read()
+    data = orjson.loads(raw) if orjson else json.loads(raw)
 
-def extract_data(input_file, output_file):
-    # Load the JSON data from the file
-    with open(input_file, 'r') as file:
-        data = json.load(file)
-    
     # Retrieve the list of sequences, assuming it's directly under the root of the JSON structure
-    sequence_list = data.get('sequenceList', [])
-
-    # Initialize a list to hold data extracted from each scenario flow
-    extracted_data = []
-
-    # Process each sequence in the sequenceList
-    for sequence in sequence_list:
-        # Process each scenario flow within the current sequence
-        for scenario in sequence.get('scenarioFlowList', []):
-            # Extract specified properties from the scenario flow and store them in a dictionary
-            extracted_info = {
-                'action_classification': scenario.get('action_classification', ''),
-                'action_code': scenario.get('action_code', ''),
-                'action_id': scenario.get('action_id', ''),
-                'name': scenario.get('name', ''),
-                'interface_element_id': scenario.get('interface_element_id', ''),
-                'action_name': scenario.get('action_name', '')
-            }
-            # Append the dictionary to the list of extracted data
-            extracted_data.append(extracted_info)
-
-    # Convert the list of extracted data into a DataFrame for better structure and to prepare for output
-    df = pd.DataFrame(extracted_data)
-
-    # Output the DataFrame to an Excel file, not including the DataFrame index
-    df.to_excel(output_file, index=False)
+    for sequence in data.get('sequenceList', []):
+        yield from sequence.get('scenarioFlowList', [])
+
+def extract_data(input_file, output_file):
+    # Stream the rows into an xlsxwriter workbook; constant_memory mode flushes each row to disk once
+    # it is complete, so only the current row is ever held in memory
+    headers = ('action_classification', 'action_code', 'action_id', 'name', 'interface_element_id', 'action_name')
+    wb = xlsxwriter.Workbook(output_file, {'constant_memory': True, 'strings_to_urls': False})
+    ws = wb.add_worksheet()
+    ws.write_row(0, 0, headers)
+
+    # Process each scenario flow as it is parsed
+    for row_index, scenario in enumerate(iter_scenarios(input_file), start=1):
+        # Extract specified properties from the scenario flow and write them as the next row
+        ws.write_row(row_index, 0, (
+            scenario.get('action_classification', ''),
+            scenario.get('action_code', ''),
+            scenario.get('action_id', ''),
+            scenario.get('name', ''),
+            scenario.get('interface_element_id', ''),
+            scenario.get('action_name', '')
+        ))
+
+    wb.close()
 
 def main():
     # Prompt user for input and output file names
@@ -14,60 +14,62 @@ This script performs the following tasks:
 
 import os
 from datetime import datetime
+from itertools import islice
+import numpy as np
 from openpyxl import Workbook, styles
 from openpyxl.styles import Font
-from concurrent.futures import ThreadPoolExecutor
-from os import scandir, stat
+from concurrent.futures import ProcessPoolExecutor
+from os import scandir
 from tqdm import tqdm
 
 # Fiscal year cutoff for 2013 starts in July
 fy_cutoff = datetime(2012, 7, 1)
-
-def scan_files(directory):
-    """Scan the directory using scandir for improved performance."""
-    with scandir(directory) as entries:
-        for entry in entries:
-            if entry.is_dir(follow_symlinks=False):
-                yield from scan_files(entry.path)
-            elif entry.is_file(follow_symlinks=False):
-                yield entry
+# Cutoff as a POSIX timestamp so file mtimes can be compared without building datetimes
+fy_cutoff_ts = fy_cutoff.timestamp()
+# Number of file mtimes compared per vectorized block in analyze_directory. The first block is small so a
+# directory that straddles the cutoff early stops after a few stats; each later block doubles up to the maximum
+mtime_first_block_size = 64
+mtime_max_block_size = 4096
 
 def count_directories_and_files(directory):
-    """Count total directories and files."""
+    """Count total directories and files and collect the top-level subdirectories in one walk."""
     total_directories = 0
     total_files = 0
-    for entry in scandir(directory):
-        if entry.is_dir(follow_symlinks=False):
-            total_directories += 1
-            subdir_files, subdir_dirs = count_directories_and_files(entry.path)
-            total_files += subdir_files
-            total_directories += subdir_dirs
-        elif entry.is_file(follow_symlinks=False):
-            total_files += 1
-    return total_files, total_directories
+    top_level_directories = []
+    for root, dirs, files in os.walk(directory):
+        if root == directory:
+            top_level_directories = [os.path.join(root, d) for d in dirs]
+        total_directories += len(dirs)
+        total_files += len(files)
+    return total_files, total_directories, top_level_directories
 
 def analyze_directory(directory):
     """Analyze file modification dates in the directory."""
-    all_before_fy = True
-    any_before_fy = False
-    all_after_fy = True
-
-    for entry in scandir(directory):
-        if entry.is_file(follow_symlinks=False):
-            file_mod_time = datetime.fromtimestamp(stat(entry.path).st_mtime)
-            if file_mod_time < fy_cutoff:
-                any_before_fy = True
-                all_after_fy = False
-            else:
-                all_before_fy = False
-
-    if all_before_fy:
+    seen_before_fy = False
+    seen_after_fy = False
+
+    with scandir(directory) as entries:
+        # DirEntry.stat() reuses the directory handle (and is cached), unlike os.stat(entry.path)
+        mtimes = (entry.stat(follow_symlinks=False).st_mtime
+                  for entry in entries if entry.is_file(follow_symlinks=False))
+        block_size = mtime_first_block_size
+        while True:
+            # Compare mtimes against the cutoff a block at a time with numpy instead of per file in Python
+            block = np.fromiter(islice(mtimes, block_size), dtype=np.float64)
+            if not block.size:
+                break
+            before_fy = block < fy_cutoff_ts
+            seen_before_fy = seen_before_fy or bool(before_fy.any())
+            seen_after_fy = seen_after_fy or not before_fy.all()
+            # Once both sides of the cutoff have been seen the answer can no longer change
+            if seen_before_fy and seen_after_fy:
+                return (directory, 'purple')
+            block_size = min(block_size * 2, mtime_max_block_size)
+
+    # Directories with no files after the cutoff (including empty ones) are red, as before
+    if not seen_after_fy:
         return (directory, 'red')
-    elif any_before_fy:
-        return (directory, 'purple')
-    elif all_after_fy:
-        return (directory, 'blue')
-    return None
+    return (directory, 'blue')
 
 def main():
     # Prompt user for directory path or use the current directory
@@ -87,17 +89,14 @@ def main():
 
     # Count total directories and files
     print("Counting total directories and files...")
-    total_files, total_directories = count_directories_and_files(directory_to_scan)
+    total_files, total_directories, top_level_directories = count_directories_and_files(directory_to_scan)
     print(f"Total directories: {total_directories}, Total files: {total_files}")
 
-    # Analyze directories with a progress bar
-    directories = []
-    with ThreadPoolExecutor() as executor:
-        future_to_directory = {executor.submit(analyze_directory, d.path): d.path for d in scandir(directory_to_scan) if d.is_dir()}
-        for future in tqdm(future_to_directory, total=total_directories, desc="Analyzing directories"):
-            directory_analysis = future.result()
-            if directory_analysis:
-                directories.append(directory_analysis)
+    # Analyze directories with a progress bar. executor.map ships the directories to the worker
+    # processes 64 at a time, so small directories don't each pay a pickle round-trip and queue handoff
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(analyze_directory, top_level_directories, chunksize=64)
+        directories = list(tqdm(results, total=len(top_level_directories), desc="Analyzing directories"))
 
     if not directories:
         print("No directories matched the criteria.")
@@ -1,5 +1,10 @@
 import json
 
+try:
+    import orjson
+except ImportError:  # Use the stdlib parser when orjson isn't installed (DR)
+    orjson = None
+
 # Header comment block
 # Script Name: parse_test_script.py
 # Date: [Today's Date]
@@ -11,8 +16,9 @@ import json
 
 # Function to load a JSON file and return its content (DR)
 def load_json(file_path):
-    with open(file_path, 'r') as file:
-        return json.load(file)
+    with open(file_path, 'rb') as file:
+        raw = file.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
 
 # Function to parse script data from JSON and extract relevant details (DR)
 def parse_script_data(json_data):
@@ -24,16 +30,18 @@ def parse_script_data(json_data):
     actions = []
     for sequence in json_data.get('sequenceList', []):
         for scenario in sequence.get('scenarioFlowList', []):
+            get = scenario.get  # Bound once and reused for every field of this scenario (DR)
             action_detail = {
-                'action_name': scenario.get('action_name', 'No action name'),
-                'english_text': scenario.get('english_text', 'No English text'),
-                'action_code': scenario.get('action_code', 'No action code'),
-                'name': scenario.get('name', 'No name')
+                'action_name': get('action_name', 'No action name'),
+                'english_text': get('english_text', 'No English text'),
+                'action_code': get('action_code', 'No action code'),
+                'name': get('name', 'No name')
             }
 
+            # Actions stay dicts here because they are printed with their keys as JSON (DR)
             if action_detail['action_name'] == "Enter Text":
-                step_association_value = scenario.get('stepAssociation', {}).get('value', 'No value')
-                action_detail['step_association_value'] = step_association_value
+                step_association = get('stepAssociation')
+                action_detail['step_association_value'] = step_association.get('value', 'No value') if step_association else 'No value'
 
             actions.append(action_detail)
 
@@ -1,6 +1,6 @@
 import os
+import filecmp
 from datetime import datetime
-import pandas as pd
 
 # Function to get the creation date of a file
 def get_creation_date(file_path):
@@ -16,12 +16,9 @@ file2_path = "path/to/ORSISOUT20240613_Pentaho_MA1.txt"
 file1_creation_date = get_creation_date(file1_path)
 file2_creation_date = get_creation_date(file2_path)
 
-# Read the files into DataFrames
-file1_df = pd.read_csv(file1_path, header=None, names=["ID"])
-file2_df = pd.read_csv(file2_path, header=None, names=["ID"])
-
-# Check if the files are identical
-files_identical = file1_df.equals(file2_df)
+# Check if the files are identical by comparing their raw bytes in buffered chunks, stopping at the
+# first difference (filecmp already rules out files of different sizes from their stat signatures)
+files_identical = filecmp.cmp(file1_path, file2_path, shallow=False)
 
 # Print the results
 print("File 1 Creation Date:", file1_creation_date)
@@ -1,7 +1,17 @@
 import os
 import json
-import pandas as pd
-import openpyxl
+import xlsxwriter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; json.loads handles the bytes when it is missing (DR)
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Without ijson every file is parsed whole with load_json (DR)
+    ijson = None
 
 # Header comment block
 # Script Name: parse_test_scripts_to_tables.py
@@ -12,10 +22,43 @@ import openpyxl
 # and exports this information into a structured Excel file. This facilitates easy
 # analysis and review of script actions and properties.
 
+# Characters Excel doesn't allow in sheet names (plus spaces), each mapped to '_' by one str.translate call (DR)
+_SHEET_TRANS = str.maketrans({c: '_' for c in '/\\*?:[] '})
+
+# Files of at least this many bytes are streamed with ijson; smaller ones parse faster in one go (DR)
+stream_threshold = 1024 * 1024
+
+# Column order of the action tuples built by parse_script_data (DR)
+ACTION_COLUMNS = ('action_name', 'english_text', 'action_code', 'name', 'step_association_value')
+
 # Function to load a JSON file and return its content (DR)
+# The file is read as bytes, which orjson parses directly without a decode step (DR)
 def load_json(file_path):
-    with open(file_path, 'r') as file:
-        return json.load(file)
+    with open(file_path, 'rb') as file:
+        raw = file.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+# Function to turn scenario flow entries into action tuples (DR)
+def parse_actions(scenarios):
+    actions = []
+    for scenario in scenarios:
+        get = scenario.get  # Look the method up once per scenario rather than once per field (DR)
+        action_name = get('action_name', 'No action name')
+        step_association_value = None
+        if action_name == "Enter Text":
+            step_association = get('stepAssociation')
+            step_association_value = step_association.get('value', 'No value') if step_association else 'No value'
+
+        # Each action is a tuple in ACTION_COLUMNS order, ready to be written as a row (DR)
+        actions.append((
+            action_name,
+            get('english_text', 'No English text'),
+            get('action_code', 'No action code'),
+            get('name', 'No name'),
+            step_association_value
+        ))
+
+    return actions
 
 # Function to parse script data from JSON and extract relevant details (DR)
 def parse_script_data(json_data):
@@ -24,48 +67,65 @@ def parse_script_data(json_data):
         'description': json_data.get('automationSequence', {}).get('description', 'No description')
     }
 
-    actions = []
-    for sequence in json_data.get('sequenceList', []):
-        for scenario in sequence.get('scenarioFlowList', []):
-            action_detail = {
-                'action_name': scenario.get('action_name', 'No action name'),
-                'english_text': scenario.get('english_text', 'No English text'),
-                'action_code': scenario.get('action_code', 'No action code'),
-                'name': scenario.get('name', 'No name')
-            }
-
-            if action_detail['action_name'] == "Enter Text":
-                step_association = scenario.get('stepAssociation')
-                if step_association is not None:
-                    step_association_value = step_association.get('value', 'No value')
-                else:
-                    step_association_value = 'No value'
-                action_detail['step_association_value'] = step_association_value
-
-            actions.append(action_detail)
+    scenarios = (scenario for sequence in json_data.get('sequenceList', [])
+                 for scenario in sequence.get('scenarioFlowList', []))
+    return script_info, parse_actions(scenarios)
+
+# Function to parse a large script file with ijson, streaming one scenario at a time instead of loading the document (DR)
+def parse_script_file_streaming(file_path):
+    with open(file_path, 'rb') as file:
+        automation_sequence = next(ijson.items(file, 'automationSequence', use_float=True), {})
+        file.seek(0)
+        actions = parse_actions(ijson.items(file, 'sequenceList.item.scenarioFlowList.item', use_float=True))
 
+    script_info = {
+        'name': automation_sequence.get('name', 'No name'),
+        'description': automation_sequence.get('description', 'No description')
+    }
     return script_info, actions
 
 # Function to export script data to Excel, handling naming conventions for sheets and tables (DR)
+# constant_memory is left off: it holds a temp file open per worksheet, and this writer adds one sheet per script (DR)
 def export_to_excel(scripts_data, output_file):
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-        sheet_name_count = {}  # Keep track of duplicate sheet names (DR)
-        table_name_count = {}  # Keep track of duplicate table names (DR)
-        for script_name, actions in scripts_data.items():
-            base_sheet_name = script_name[:31].replace('/', '_').replace('\\', '_').replace('*', '_').replace('?', '_').replace(':', '_').replace('[', '_').replace(']', '_').replace(' ', '_')
-            sheet_name_count[base_sheet_name] = sheet_name_count.get(base_sheet_name, 0) + 1
-            sheet = writer.book.create_sheet(title=f"{base_sheet_name}_{sheet_name_count[base_sheet_name]}")
-            df = pd.DataFrame(actions)
-            df.to_excel(writer, sheet_name=sheet.name, index=False)
+    wb = xlsxwriter.Workbook(output_file, {'strings_to_urls': False})
+    sheet_name_count = {}  # Keep track of duplicate sheet names (DR)
+    table_name_count = {}  # Keep track of duplicate table names (DR)
+    used_sheet_names = set()  # Lower-cased, since Excel compares sheet names case-insensitively (DR)
+    for script_name, actions in scripts_data.items():
+        base_sheet_name = script_name[:31].translate(_SHEET_TRANS)
+        name_key = base_sheet_name.lower()
+        sheet_count = sheet_name_count.get(name_key, 0)
+        sheet_name = base_sheet_name
+        # Only a name that is already taken gets a numeric suffix, with the base trimmed so it still fits
+        # in Excel's 31 character limit, which xlsxwriter enforces (DR)
+        while sheet_name.lower() in used_sheet_names:
+            sheet_count += 1
+            suffix = f"_{sheet_count}"
+            sheet_name = base_sheet_name[:31 - len(suffix)] + suffix
+        sheet_name_count[name_key] = sheet_count
+        used_sheet_names.add(sheet_name.lower())
+        ws = wb.add_worksheet(sheet_name)
+        # The step association column is only added when the script has an "Enter Text" action (DR)
+        has_enter_text = any(action[0] == "Enter Text" for action in actions)
+        ws.write_row(0, 0, ACTION_COLUMNS if has_enter_text else ACTION_COLUMNS[:-1])
+        for row_index, action in enumerate(actions, start=1):
+            ws.write_row(row_index, 0, action)
+    wb.close()
+
+# Function to load and parse a single JSON file, kept at module level so the process pool can pickle it (DR)
+def _parse_one(file_path):
+    if ijson and os.path.getsize(file_path) >= stream_threshold:
+        return parse_script_file_streaming(file_path)
+    json_data = load_json(file_path)
+    return parse_script_data(json_data)
 
 # Function to process all JSON files in a directory and collect their data (DR)
+# Files are parsed in worker processes, 16 per task to spread the pickling cost (DR)
 def process_directory(directory):
+    file_paths = [os.path.join(directory, filename) for filename in os.listdir(directory) if filename.endswith('.json')]
     scripts_data = {}
-    for filename in os.listdir(directory):
-        if filename.endswith('.json'):
-            file_path = os.path.join(directory, filename)
-            json_data = load_json(file_path)
-            script_info, actions = parse_script_data(json_data)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for script_info, actions in executor.map(_parse_one, file_paths, chunksize=16):
             scripts_data[script_info['name']] = actions
     return scripts_data
 
@@ -7,26 +7,28 @@ Date: 2024-06-25
 This script performs the following tasks:
 1. Prompts for a directory path to parse or uses the current directory if none is provided.
 2. Ensures the specified directory exists.
-3. Retrieves all files in the directory and its subdirectories using efficient directory traversal.
+3. Walks the tree once bottom-up, one top-level subtree per worker process, rolling each subdirectory's file totals up into its parents as it goes.
 4. Calculates file statistics including total number of files, total file size, and splits these by the fiscal year 2013 cutoff.
 5. Outputs the directory statistics into an Excel spreadsheet and provides a grand total at the end.
-6. Writes the directory statistics to a MySQL database.
-7. Allows pausing the script using Ctrl+Z.
+6. Writes the directory statistics to a MySQL database once the scan is done; the Excel output is kept if that fails.
+7. Allows pausing and resuming the script with a signal (SIGUSR1, or Ctrl+Break on Windows).
 8. Clears all records in the database table before writing new data.
 """
 
 import os
-import time
+import signal
+import threading
 import mysql.connector
+import numpy as np
 from datetime import datetime
-from openpyxl import Workbook
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from os import scandir, stat
+import xlsxwriter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
-import keyboard
 
 # Fiscal year cutoff for 2013 starts in July
 fy_cutoff = datetime(2012, 7, 1)
+# Cutoff as a POSIX timestamp so raw st_mtime values can be compared without building datetimes
+fy_cutoff_ts = fy_cutoff.timestamp()
 
 # Database connection details
 db_config = {
@@ -36,67 +38,47 @@ db_config = {
     'database': 'delete_week'
 }
 
-# Global pause flag
-paused = False
+# Set while the scan is running and cleared while it is paused
+running = threading.Event()
+running.set()
 
-def handle_pause():
-    global paused
-    paused = not paused
-    if paused:
-        print("Script paused. Press Ctrl+Z to resume.")
+# SIGUSR1 (kill -USR1 <pid>) toggles the pause; Windows has no SIGUSR1, so Ctrl+Break is used there
+pause_signal = getattr(signal, 'SIGUSR1', None) or signal.SIGBREAK
+
+def handle_pause(signum, frame):
+    if running.is_set():
+        running.clear()
+        print("Script paused. Send the pause signal again to resume.")
     else:
+        running.set()
         print("Script resumed.")
 
-# Set the keyboard listener for Ctrl+Z
-keyboard.add_hotkey('ctrl+z', handle_pause)
-
-def scan_files(directory):
-    """Scan the directory using scandir for improved performance."""
-    with scandir(directory) as entries:
-        for entry in entries:
-            if entry.is_dir(follow_symlinks=False):
-                # Recursively scan subdirectories.
-                yield from scan_files(entry.path)
-            elif entry.is_file(follow_symlinks=False):
-                # Yield file entries.
-                yield entry
-
-def count_directories_and_files(directory):
-    """Count total directories and files."""
-    total_directories = 0
-    total_files = 0
-    with scandir(directory) as entries:
-        for entry in entries:
-            if entry.is_dir(follow_symlinks=False):
-                total_directories += 1
-                # Recursively count files and directories in subdirectories.
-                subdir_files, subdir_dirs = count_directories_and_files(entry.path)
-                total_files += subdir_files
-                total_directories += subdir_dirs
-            elif entry.is_file(follow_symlinks=False):
-                total_files += 1
-    return total_files, total_directories
-
-def analyze_directory(directory):
-    """Analyze file statistics in the directory."""
-    total_files = 0
-    total_size = 0
-    files_before_fy = 0
-    size_before_fy = 0
-    files_after_fy = 0
-    size_after_fy = 0
-
-    for entry in scan_files(directory):
-        total_files += 1
-        file_size = stat(entry.path).st_size
-        total_size += file_size
-        file_mod_time = datetime.fromtimestamp(stat(entry.path).st_mtime)
-        if file_mod_time < fy_cutoff:
-            files_before_fy += 1
-            size_before_fy += file_size
-        else:
-            files_after_fy += 1
-            size_after_fy += file_size
+def ignore_pause_signal():
+    """Worker initializer: leave pausing to the main process (Ctrl+Break reaches every process on the console)."""
+    signal.signal(pause_signal, signal.SIG_IGN)
+
+def analyze_directory(directory, file_entries):
+    """Analyze the files directly inside one directory, given as the os.DirEntry objects from its listing."""
+    file_stats = []
+    for entry in file_entries:
+        try:
+            # Only regular files are counted; symlinks and special files are skipped. The type comes from the
+            # listing, and on Windows the stat does too, so neither costs another system call there
+            if entry.is_file(follow_symlinks=False):
+                file_stats.append(entry.stat(follow_symlinks=False))
+        except OSError:
+            # Removed or unreadable since the directory was listed
+            continue
+
+    # Reduce sizes and mtimes as arrays rather than branching on every file in Python
+    total_files = len(file_stats)
+    sizes = np.fromiter((st.st_size for st in file_stats), dtype=np.int64, count=total_files)
+    mtimes = np.fromiter((st.st_mtime for st in file_stats), dtype=np.float64, count=total_files)
+    before_fy = mtimes < fy_cutoff_ts
+
+    total_size = int(sizes.sum())
+    files_before_fy = int(before_fy.sum())
+    size_before_fy = int(sizes[before_fy].sum())
 
     return {
         'directory': directory,
@@ -104,51 +86,178 @@ def analyze_directory(directory):
         'total_size': total_size,
         'files_before_fy': files_before_fy,
         'size_before_fy': size_before_fy,
-        'files_after_fy': files_after_fy,
-        'size_after_fy': size_after_fy
+        'files_after_fy': total_files - files_before_fy,
+        'size_after_fy': total_size - size_before_fy
     }
 
+def report_walk_error(error):
+    """Report a directory that could not be listed; the scan carries on without it."""
+    print(f"Error analyzing directory {error.filename}: {error}")
+
+def list_directory(directory):
+    """List a directory once with os.scandir.
+
+    Returns the DirEntry objects for everything that is not a subdirectory and the paths of its
+    subdirectories, or None if it could not be listed. Symlinks to directories are not followed.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError as error:
+        report_walk_error(error)
+        return None
+    file_entries = []
+    subdirectories = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            is_dir = False
+        if is_dir:
+            subdirectories.append(entry.path)
+        else:
+            file_entries.append(entry)
+    return file_entries, subdirectories
+
+# Statistics that are summed from each directory into its parent
+stat_keys = ('total_files', 'total_size', 'files_before_fy', 'size_before_fy', 'files_after_fy', 'size_after_fy')
+
+def add_totals(dir_stats, child_stats):
+    """Add a subdirectory's rolled-up totals into its parent's stats."""
+    for key in stat_keys:
+        dir_stats[key] += child_stats[key]
+
+def scan_tree(top):
+    """Walk one subtree bottom-up with os.scandir and analyze every directory in it.
+
+    Runs in a worker process, one call per top-level subdirectory, so each task covers a
+    whole subtree and its results come back in one piece. Each directory's files are analyzed
+    from the DirEntry objects as soon as it is listed; the directory goes back on the stack
+    beneath its subdirectories, so its totals are rolled up once all of theirs are complete.
+
+    Returns a dict of per-directory stats covering each directory's whole subtree and a dict
+    of each directory's subdirectories.
+    """
+    results = {}
+    children = {}
+    # Each entry is (directory, None) until the directory is listed, then (directory, its own stats)
+    stack = [(top, None)]
+    while stack:
+        directory, dir_stats = stack.pop()
+        if dir_stats is None:
+            listing = list_directory(directory)
+            if listing is None:
+                continue
+            file_entries, subdirectories = listing
+            stack.append((directory, analyze_directory(directory, file_entries)))
+            stack.extend((subdirectory, None) for subdirectory in reversed(subdirectories))
+            children[directory] = subdirectories
+            continue
+        for subdirectory in children[directory]:
+            # Missing if it could not be listed
+            child_stats = results.get(subdirectory)
+            if child_stats:
+                add_totals(dir_stats, child_stats)
+        results[directory] = dir_stats
+    return results, children
+
+def tree_order(root, results, children):
+    """Return the analyzed directories in tree order, each parent before its children."""
+    order = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        if directory not in results:
+            # Skipped because it could not be analyzed
+            continue
+        order.append(directory)
+        stack.extend(reversed(children[directory]))
+    return order
+
+# Size units used by format_size, built once rather than as a new list on every call
+size_units = ('B', 'KB', 'MB', 'GB', 'TB')
+
 def format_size(size):
     """Convert size to a readable format (bytes, KB, MB, GB)."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+    for unit in size_units:
         if size < 1024:
             return f"{size:.2f} {unit}"
         size /= 1024
 
-def clear_database():
+# Number of directory rows buffered in memory before they are written to MySQL with one executemany
+db_batch_size = 1000
+
+insert_query = """
+INSERT INTO output_directory_scan_data 
+(Directory, total_files, files_before_end_date, files_after_end_date, total_size_of_files_before_ed, total_size_of_files_after_ed) 
+VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+def clear_database(connection):
     """Clear all records in the database table."""
-    connection = mysql.connector.connect(**db_config)
     cursor = connection.cursor()
     cursor.execute("TRUNCATE TABLE output_directory_scan_data")
     connection.commit()
     cursor.close()
-    connection.close()
 
-def save_to_database(data):
-    """Save directory analysis data to the MySQL database."""
-    connection = mysql.connector.connect(**db_config)
-    cursor = connection.cursor()
-    
-    insert_query = """
-    INSERT INTO output_directory_scan_data 
-    (Directory, total_files, files_before_end_date, files_after_end_date, total_size_of_files_before_ed, total_size_of_files_after_ed) 
-    VALUES (%s, %s, %s, %s, %s, %s)
+def disable_bulk_load_checks(connection):
+    """Turn off per-row constraint checks for this session while the scan results are inserted.
+
+    The settings are session-scoped, so they end when the connection is closed.
     """
-    
-    cursor.execute(insert_query, (
-        data['directory'],
-        data['total_files'],
-        data['files_before_fy'],
-        data['files_after_fy'],
-        str(data['size_before_fy']),
-        str(data['size_after_fy'])
-    ))
-    
-    connection.commit()
+    cursor = connection.cursor()
+    cursor.execute("SET SESSION unique_checks = 0")
+    cursor.execute("SET SESSION foreign_key_checks = 0")
     cursor.close()
-    connection.close()
+
+def connect_to_database():
+    """Open the database connection, clear the table and turn off the bulk load checks.
+
+    Returns None if any of that fails, so the results still go to the Excel file.
+    """
+    connection = None
+    try:
+        connection = mysql.connector.connect(**db_config)
+        clear_database(connection)
+        disable_bulk_load_checks(connection)
+    except mysql.connector.Error as err:
+        print(f"Database error, results will only be written to Excel: {err}")
+        if connection is not None:
+            connection.close()
+        return None
+    return connection
+
+def save_to_database(connection, rows):
+    """Save a batch of directory analysis rows to the MySQL database in a single transaction.
+
+    Returns False if the batch could not be written.
+    """
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.executemany(insert_query, [(
+                data['directory'],
+                data['total_files'],
+                data['files_before_fy'],
+                data['files_after_fy'],
+                str(data['size_before_fy']),
+                str(data['size_after_fy'])
+            ) for data in rows])
+            connection.commit()
+        finally:
+            cursor.close()
+    except mysql.connector.Error as err:
+        print(f"Database error, remaining results will only be written to Excel: {err}")
+        return False
+    return True
 
 def main():
+    # Install the pause handler here rather than at import, so worker processes that
+    # re-import this module don't install their own
+    signal.signal(pause_signal, handle_pause)
+    print(f"Send {pause_signal.name} to process {os.getpid()} to pause or resume the scan.")
+
+    connection = None
     try:
         # Prompt user for directory path or use the current directory
         directory_input = input("Enter the directory to parse (press enter to use current directory): ")
@@ -165,96 +274,126 @@ def main():
         if not output_file.endswith('.xlsx'):
             output_file = os.path.join(output_file, 'DirectoryAnalysis.xlsx')
 
-        # Clear the database table before writing new data
-        clear_database()
-
-        # Count total directories and files
-        print("Counting total directories and files...")
-        total_files, total_directories = count_directories_and_files(directory_to_scan)
-        print(f"Total directories: {total_directories}, Total files: {total_files}")
-
-        # Initialize the workbook and sheet
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Directory Analysis"
+        # The scanned directory's own files are analyzed here; each top-level subdirectory is walked as one
+        # task in a worker process (one per CPU by default), so every directory is listed exactly once and
+        # the pool handles a few large tasks rather than one tiny task per directory
+        results = {}
+        children = {}
+        listing = list_directory(directory_to_scan)
+        # None if the scanned directory itself could not be listed; the error has been reported
+        if listing is not None:
+            file_entries, subdirectories = listing
+            results[directory_to_scan] = analyze_directory(directory_to_scan, file_entries)
+            children[directory_to_scan] = subdirectories
+
+        with ProcessPoolExecutor(initializer=ignore_pause_signal) as executor:
+            futures = {executor.submit(scan_tree, subtree): subtree for subtree in children.get(directory_to_scan, [])}
+            with tqdm(total=len(futures), desc="Analyzing directories") as progress:
+                for future in as_completed(futures):
+                    subtree = futures[future]
+                    # Wait in short slices so the resume signal's handler can still run on Windows,
+                    # where a blocking Event.wait() isn't interrupted by signals
+                    while not running.wait(1):
+                        pass
+                    try:
+                        subtree_results, subtree_children = future.result()
+                    except Exception as e:
+                        print(f"Error analyzing directory {subtree}: {e}")
+                    else:
+                        results.update(subtree_results)
+                        children.update(subtree_children)
+                        # The subtree's top directory already covers everything below it; it is missing
+                        # if it could not be listed
+                        subtree_stats = subtree_results.get(subtree)
+                        if subtree_stats:
+                            add_totals(results[directory_to_scan], subtree_stats)
+                    # Show the latest subtree on the progress bar; a print per directory would scroll
+                    # the terminal and flush stdout for every entry in the tree
+                    progress.set_postfix_str(subtree, refresh=False)
+                    progress.update(1)
+
+        # Totals were rolled up during the walk; only the output order is left to work out
+        directories = tree_order(directory_to_scan, results, children)
+        root_stats = results.get(directory_to_scan, dict.fromkeys(stat_keys, 0))
+        print(f"Total directories: {max(len(directories) - 1, 0)}, Total files: {root_stats['total_files']}, "
+              f"Total size: {format_size(root_stats['total_size'])}")
+
+        # Open a single database connection for the writes and clear the table before writing new data. This
+        # waits until the scan is done, so a long or paused scan can't leave the connection timed out, and the
+        # old data is only cleared once there are results to replace it
+        connection = connect_to_database()
+        pending_rows = []
+
+        # Initialize the workbook and sheet; constant_memory streams each finished row to disk
+        wb = xlsxwriter.Workbook(output_file, {'constant_memory': True})
+        ws = wb.add_worksheet("Directory Analysis")
+        # Sizes are stored as raw byte counts so they can be summed in Excel; the column format adds
+        # thousands separators for display
+        size_format = wb.add_format({'num_format': '#,##0'})
+        ws.set_column(4, 6, None, size_format)
 
         # Write headers
-        headers = ["Directory", "Total Files", "Files Before FY 2013", "Files After FY 2013",
-                   "Total Size", "Size Before FY 2013", "Size After FY 2013"]
-        ws.append(headers)
-
-        # Initialize grand totals
-        grand_total_files = 0
-        grand_files_before_fy = 0
-        grand_files_after_fy = 0
-        grand_total_size = 0
-        grand_size_before_fy = 0
-        grand_size_after_fy = 0
-
-        # Analyze directories with a progress bar
-        directories = [directory_to_scan]
-        for root, dirs, files in os.walk(directory_to_scan):
-            for d in dirs:
-                directories.append(os.path.join(root, d))
-
-        # Set maximum number of threads to reduce memory usage
-        max_workers = min(32, len(directories))
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_directory = {executor.submit(analyze_directory, d): d for d in directories}
-            for future in tqdm(as_completed(future_to_directory), total=len(directories), desc="Analyzing directories"):
-                while paused:
-                    time.sleep(1)
-                try:
-                    directory_analysis = future.result()
-                    if directory_analysis:
-                        dir_stats = directory_analysis
-                        
-                        # Print the current directory being analyzed
-                        print(f"Currently analyzing: {dir_stats['directory']}")
-
-                        grand_total_files += dir_stats['total_files']
-                        grand_files_before_fy += dir_stats['files_before_fy']
-                        grand_files_after_fy += dir_stats['files_after_fy']
-                        grand_total_size += dir_stats['total_size']
-                        grand_size_before_fy += dir_stats['size_before_fy']
-                        grand_size_after_fy += dir_stats['size_after_fy']
-                        
-                        ws.append([
-                            dir_stats['directory'],
-                            dir_stats['total_files'],
-                            dir_stats['files_before_fy'],
-                            dir_stats['files_after_fy'],
-                            format_size(dir_stats['total_size']),
-                            format_size(dir_stats['size_before_fy']),
-                            format_size(dir_stats['size_after_fy'])
-                        ])
-                        
-                        # Save to database
-                        save_to_database(dir_stats)
-                        
-                except Exception as e:
-                    print(f"Error analyzing directory {future_to_directory[future]}: {e}")
+        headers = ("Directory", "Total Files", "Files Before FY 2013", "Files After FY 2013",
+                   "Total Size (bytes)", "Size Before FY 2013 (bytes)", "Size After FY 2013 (bytes)")
+        ws.write_row(0, 0, headers)
+
+        for row_index, directory in enumerate(directories, start=1):
+            dir_stats = results[directory]
+            ws.write_row(row_index, 0, (
+                dir_stats['directory'],
+                dir_stats['total_files'],
+                dir_stats['files_before_fy'],
+                dir_stats['files_after_fy'],
+                dir_stats['total_size'],
+                dir_stats['size_before_fy'],
+                dir_stats['size_after_fy']
+            ))
+
+            # Buffer the row and write to the database in batches; after a failed batch the
+            # database is dropped and the rest of the rows only go to Excel
+            if connection is not None:
+                pending_rows.append(dir_stats)
+                if len(pending_rows) >= db_batch_size:
+                    rows, pending_rows = pending_rows, []
+                    if not save_to_database(connection, rows):
+                        connection.close()
+                        connection = None
+
+        # Write any rows still buffered for the database
+        if connection is not None and pending_rows:
+            save_to_database(connection, pending_rows)
+
+        # The scanned directory's rolled-up row already covers the whole tree; summing every row
+        # would count nested files once for each ancestor
+        grand_total_files = root_stats['total_files']
+        grand_files_before_fy = root_stats['files_before_fy']
+        grand_files_after_fy = root_stats['files_after_fy']
+        grand_total_size = root_stats['total_size']
+        grand_size_before_fy = root_stats['size_before_fy']
+        grand_size_after_fy = root_stats['size_after_fy']
 
         # Write grand totals
-        ws.append([
+        ws.write_row(len(directories) + 1, 0, (
             "Grand Total",
             grand_total_files,
             grand_files_before_fy,
             grand_files_after_fy,
-            format_size(grand_total_size),
-            format_size(grand_size_before_fy),
-            format_size(grand_size_after_fy)
-        ])
+            grand_total_size,
+            grand_size_before_fy,
+            grand_size_after_fy
+        ))
 
         # Save the workbook
-        wb.save(output_file)
+        wb.close()
         print(f"Directory analysis has been saved to {output_file}")
 
     except KeyboardInterrupt:
         print("Process interrupted by user. Exiting...")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
+    finally:
+        if connection is not None:
+            connection.close()
 
 if __name__ == "__main__":
     main()
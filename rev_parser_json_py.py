@@ -1,3 +1,42 @@
+import re
+from functools import lru_cache
+
+# One pass over an action: the element locator, then the WebDriver call made on it and that call's argument.
+# The call may be chained on the next line or made on a variable in a later statement, hence re.S and the lazy gap;
+# the gap stops at the next locator call so a call is never credited to an earlier element.
+_ACTION_RE = re.compile(
+    r'find_elements?(?:_by_(?P<by>xpath|css_selector|id|name|class_name|tag_name)\(\s*'
+    r'|\(\s*By\.(?P<by_const>XPATH|CSS_SELECTOR|ID|NAME|CLASS_NAME|TAG_NAME)\s*,\s*)'
+    r'(?P<quote>["\'])(?P<selector>(?:\\.|(?!(?P=quote))[^\\])*)(?P=quote)\s*\)'
+    r'(?:(?!find_elements?[_(]).)*?\.\s*(?P<verb>click|send_keys)\(\s*'
+    r'(?P<data>"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|[^)]*?)\s*\)',
+    re.S
+)
+
+# CSS templates for the non-XPath locator strategies; css_selector is already CSS
+_LOCATOR_CSS = {
+    'css_selector': '{}',
+    'id': '#{}',
+    'name': "[name='{}']",
+    'class_name': '.{}',
+    'tag_name': '{}',
+}
+
+def locator_to_css(match):
+    """
+    Converts the locator of a matched action into a CSS selector.
+    
+    Args:
+    match (re.Match): A match of the action pattern.
+    
+    Returns:
+    str: The CSS selector, or None if the XPath cannot be expressed in CSS.
+    """
+    strategy = match.group('by') or match.group('by_const').lower()
+    if strategy == 'xpath':
+        return convert_xpath_to_css(match.group('selector'))
+    return _LOCATOR_CSS[strategy].format(match.group('selector'))
+
 def translate_action(action_code):
     """
     Translates WebDriver actions into equivalent Cypress commands.
@@ -6,17 +45,19 @@ def translate_action(action_code):
     action_code (str): The WebDriver action code.
     
     Returns:
-    tuple: A selector and Cypress command based on the action.
+    tuple: A selector and Cypress command based on the action, or None if the action is not recognized.
     """
-    if "click()" in action_code:
-        xpath = extract_xpath(action_code)
-        css_selector = convert_xpath_to_css(xpath)
+    match = _ACTION_RE.search(action_code)
+    if not match:
+        return None
+    css_selector = locator_to_css(match)
+    if match.group('verb') == 'click':
         return css_selector, "click()"
-    elif "send_keys" in action_code:
-        xpath = extract_xpath(action_code, mode='input')
-        css_selector = convert_xpath_to_css(xpath)
-        data = extract_data(action_code)
-        return css_selector, f"type('{data}')"
+    data = match.group('data')
+    if data[:1] in ('"', "'"):
+        return css_selector, f"type('{data[1:-1]}')"
+    # Not a string literal (a variable, Keys.ENTER, ...); pass the expression through as-is
+    return css_selector, f"type({data})"
 
 def extract_xpath(action_code, mode='default'):
     """
@@ -24,19 +65,15 @@ def extract_xpath(action_code, mode='default'):
     
     Args:
     action_code (str): The WebDriver action code.
-    mode (str): Specific mode for extraction, 'default' or 'input' for different handling.
+    mode (str): Kept for compatibility; the compiled action pattern handles both click and input lines.
     
     Returns:
-    str: The extracted XPath expression.
+    str: The extracted XPath expression, or None if the action code has no XPath locator.
     """
-    # Simplistic extraction; needs proper implementation based on actual action code structure
-    if mode == 'input':
-        start = action_code.find('(\"') + 2
-        end = action_code.find('\")')
-    else:
-        start = action_code.find('(\"') + 2
-        end = action_code.rfind('\")')  # Handles multiple occurrences
-    return action_code[start:end]
+    match = _ACTION_RE.search(action_code)
+    if match and (match.group('by') or match.group('by_const').lower()) == 'xpath':
+        return match.group('selector')
+    return None
 
 def extract_data(action_code):
     """
@@ -46,22 +83,89 @@ def extract_data(action_code):
     action_code (str): The WebDriver action code.
     
     Returns:
-    str: The data to be typed.
+    str: The data to be typed, without its quotes if it is a string literal, or None if the
+    action code is not a send_keys call.
     """
-    # Simplified extraction assuming structure; needs to be adapted based on actual content
-    start = action_code.rfind('send_keys(\"') + 11
-    end = action_code.rfind('\")')
-    return action_code[start:end]
+    match = _ACTION_RE.search(action_code)
+    if not match or match.group('verb') != 'send_keys':
+        return None
+    data = match.group('data')
+    return data[1:-1] if data[:1] in ('"', "'") else data
 
+# Compiled once; an XPath is split into steps, and each step's predicates are matched against the rules below
+_STEP_RE = re.compile(r"(//?)([\w-]+|\*)((?:\[[^\]]*\])*)")
+_PREDICATE_RE = re.compile(r"\[([^\]]*)\]")
+_CSS_IDENT_RE = re.compile(r"^[A-Za-z_][\w-]*$")
+_PREDICATE_RULES = (
+    (re.compile(r"^@([\w-]+)\s*=\s*(['\"])(.*?)\2$"), '='),
+    (re.compile(r"^contains\(@([\w-]+),\s*(['\"])(.*?)\2\)$"), '*='),
+    (re.compile(r"^starts-with\(@([\w-]+),\s*(['\"])(.*?)\2\)$"), '^='),
+    (re.compile(r"^@([\w-]+)$"), None),
+)
+
+def convert_predicate(predicate):
+    """
+    Converts a single XPath predicate (the text between the brackets) into a CSS fragment.
+    
+    Args:
+    predicate (str): The XPath predicate, e.g. "@id='login'".
+    
+    Returns:
+    str: The CSS fragment, or None if the predicate has no CSS equivalent.
+    """
+    predicate = predicate.strip()
+    for pattern, operator in _PREDICATE_RULES:
+        match = pattern.match(predicate)
+        if not match:
+            continue
+        attribute = match.group(1)
+        if operator is None:
+            return f"[{attribute}]"
+        value = match.group(3)
+        if operator == '=' and _CSS_IDENT_RE.match(value):
+            if attribute == 'id':
+                return '#' + value
+            if attribute == 'class':
+                return '.' + value
+        escaped = value.replace("'", "\\'")
+        return f"[{attribute}{operator}'{escaped}']"
+    return None
+
+@lru_cache(maxsize=1024)
 def convert_xpath_to_css(xpath):
     """
     Converts an XPath selector into a CSS selector if possible.
     
+    Handles the shapes recorded scripts use most: tag and * steps joined by / or //,
+    attribute equality, contains() and starts-with() on attributes, attribute presence
+    and a leading positional index. Results are cached since the same XPaths repeat
+    throughout a script.
+    
     Args:
     xpath (str): The XPath selector.
     
     Returns:
-    str: A CSS selector equivalent.
+    str: A CSS selector equivalent, or None if the XPath cannot be expressed in CSS.
     """
-    # Placeholder; conversion logic depends heavily on the specifics of the XPath
-    return "css_selector_equivalent"
+    parts = []
+    position = 0
+    for step in _STEP_RE.finditer(xpath):
+        if step.start() != position:
+            return None  # Something between steps that isn't a plain / or // step (axes, functions, unions)
+        position = step.end()
+        separator, tag, predicates = step.groups()
+        css = '' if tag == '*' else tag
+        for index, predicate in enumerate(_PREDICATE_RE.findall(predicates)):
+            if predicate.strip().isdigit() and index == 0:
+                css += f":nth-{'child' if tag == '*' else 'of-type'}({predicate.strip()})"
+                continue
+            fragment = convert_predicate(predicate)
+            if fragment is None:
+                return None
+            css += fragment
+        if parts:
+            parts.append(' ' if separator == '//' else ' > ')
+        parts.append(css or '*')
+    if not parts or position != len(xpath):
+        return None
+    return ''.join(parts)
@@ -7,41 +7,60 @@
 
 import sys
 import pandas as pd
+import xlsxwriter
+
+try:
+    import python_calamine
+except ImportError:  # DR: Without the Rust calamine reader pandas falls back to its default openpyxl engine
+    python_calamine = None
+
+# DR: Translation table mapping every character Excel forbids in sheet names to an underscore
+_SHEET_TRANS = str.maketrans({ch: '_' for ch in '[]:*?/\\'})
 
 def sanitize_sheet_name(name):
     # DR: Remove or replace invalid characters for Excel sheet names and truncate to the maximum length allowed by Excel.
-    invalid_chars = '[]:*?/\\'
-    for ch in invalid_chars:
-        name = name.replace(ch, '_')  # Replace invalid characters with an underscore
-    return name[:31]  # Excel sheet names have a max length of 31 characters
+    return name.translate(_SHEET_TRANS)[:31]  # Excel sheet names have a max length of 31 characters
+
+def unique_sheet_name(sheet_name, used_sheet_names):
+    # DR: Fields that collide once sanitized or truncated, or that differ only by case, get a numbered suffix,
+    # DR: cutting the name back so it still fits in 31 characters.
+    base_sheet_name = sheet_name
+    sheet_count = 0
+    while sheet_name.lower() in used_sheet_names:
+        sheet_count += 1
+        suffix = f"_{sheet_count}"
+        sheet_name = base_sheet_name[:31 - len(suffix)] + suffix
+    used_sheet_names.add(sheet_name.lower())
+    return sheet_name
 
 def process_excel(input_file):
-    # DR: Load the spreadsheet and prepare dictionaries to store counts of important fields
-    data = pd.read_excel(input_file)
-    field_summary = {}
-
-    # DR: Process each row in the DataFrame to count occurrences of each field value
-    for index, row in data.iterrows():
-        field_key = row['Field'].strip()
-        field_value = str(row['Field Value']).strip()
-
-        # Initialize the dictionary for each field key if not already present
-        if field_key not in field_summary:
-            field_summary[field_key] = {}
-
-        # Count occurrences of each field value
-        if field_value in field_summary[field_key]:
-            field_summary[field_key][field_value] += 1
-        else:
-            field_summary[field_key][field_value] = 1
-
-    # DR: Create new Excel writer to write the summary tab for each field
-    with pd.ExcelWriter('output_summary_data.xlsx', engine='xlsxwriter') as writer:
-        for key, value_counts in field_summary.items():
-            summary_df = pd.DataFrame(list(value_counts.items()), columns=['Value', 'Count'])
+    # DR: Load only the two columns that are summarized, read as strings so pandas skips type inference
+    data = pd.read_excel(input_file, sheet_name=0, usecols=['Field', 'Field Value'],
+                         dtype={'Field': 'string', 'Field Value': 'string'},
+                         engine='calamine' if python_calamine else None)
+
+    # DR: Strip both columns once, then count every (field, value) pair in one vectorized groupby.
+    # DR: Blank values are still counted as 'nan', as the old per-row str(row['Field Value']) did.
+    fields = data['Field'].str.strip()
+    values = data['Field Value'].fillna('nan').str.strip()
+    field_counts = values.groupby(fields, sort=False).value_counts()
+
+    # DR: Create new workbook to write the summary tab for each field.
+    # DR: constant_memory is left off, as it keeps a temp file open for every sheet and there is one sheet per field.
+    # DR: URL and number detection are off since every cell is either a plain string or an integer count.
+    # DR: The with block closes the workbook even if a sheet fails, so the file handle isn't left open.
+    with xlsxwriter.Workbook('output_summary_data.xlsx', {'strings_to_urls': False,
+                                                          'strings_to_numbers': False}) as workbook:
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        used_sheet_names = set()  # DR: Lower-cased, since Excel compares sheet names case-insensitively
+        for key, value_counts in field_counts.groupby(level=0, sort=False):
+            summary_df = value_counts.droplevel(0).rename_axis('Value').reset_index(name='Count')
             summary_df = summary_df.sort_values(by='Count', ascending=False)  # Sorting by count for better organization
-            sanitized_sheet_name = sanitize_sheet_name(key)
-            summary_df.to_excel(writer, sheet_name=sanitized_sheet_name, index=False)
+            sanitized_sheet_name = unique_sheet_name(sanitize_sheet_name(key), used_sheet_names)
+            worksheet = workbook.add_worksheet(sanitized_sheet_name)
+            worksheet.write_row(0, 0, ['Value', 'Count'], header_format)
+            for row_num, row in enumerate(zip(summary_df['Value'].tolist(), summary_df['Count'].tolist()), start=1):
+                worksheet.write_row(row_num, 0, row)
 
 if __name__ == "__main__":
     # DR: Main execution block to handle command line input and process the Excel file
@@ -16,10 +16,14 @@ Features:
 - CDATA section handling.
 - Pretty-printing of XML output.
 - Logs for each processed XML file.
+- Files processed in parallel on a thread pool.
+- Optional streaming mode (iterparse) for XML files too large to load whole.
+- Optional byte pre-scan that skips files containing none of the mapping values.
 
 Requirements:
 - Python 3.x
 - lxml library for enhanced XML processing
+- orjson (optional) for faster loading of config.json
 - A valid config.json file with the modification rules.
 
 Developer:  Duane Robinson
@@ -30,10 +34,31 @@ Usage:
 - Run the script using `python xml_modifier.py`.
 """
 
+import contextlib
+import io
+import mmap
 import os
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from lxml import etree
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard json module reads the config just as well, only slower
+    orjson = None
+
+@lru_cache(maxsize=8)
+def _read_config(config_path, mtime_ns):
+    """
+    Read and parse a configuration file. Cached on the file's modification time, so a changed
+    file is re-read while repeated loads of an unchanged one are free.
+    """
+    with open(config_path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
 def load_config(config_path):
     """
     Load the configuration JSON file.
@@ -42,143 +67,496 @@ def load_config(config_path):
     config_path (str): The path to the configuration file.
 
     Returns:
-    dict: The loaded configuration as a Python dictionary.
+    dict: The loaded configuration as a Python dictionary. Loading the same unchanged file
+          again returns the same (cached) dictionary, so treat it as read-only.
     """
-    with open(config_path, 'r') as f:
-        config = json.load(f)
-    return config
+    return _read_config(os.path.abspath(config_path), os.stat(config_path).st_mtime_ns)
 
-def validate_xml_with_schema(tree, schema_path, log_file):
+def load_schema(schema_path):
     """
-    Validate the given XML tree against an XML schema (XSD).
+    Parse and compile an XML schema (XSD) so it can validate any number of trees.
     
     Parameters:
-    tree (ElementTree): The XML tree to validate.
     schema_path (str): The path to the XML schema file (.xsd).
+
+    Returns:
+    XMLSchema: The compiled schema.
+    """
+    return etree.XMLSchema(etree.parse(schema_path))
+
+def validate_xml_with_schema(tree, schema, schema_path, log_file):
+    """
+    Validate the given XML tree against a compiled XML schema (XSD).
+    
+    Parameters:
+    tree (ElementTree): The XML tree to validate.
+    schema (XMLSchema): The compiled schema, as returned by load_schema.
+    schema_path (str): The path the schema was loaded from, for the log message.
     log_file (file): The log file to write validation results.
 
     Returns:
     bool: True if the XML is valid, False otherwise.
     """
     try:
-        with open(schema_path, 'rb') as schema_file:
-            schema_root = etree.XML(schema_file.read())
-            schema = etree.XMLSchema(schema_root)
-            schema.assertValid(tree)
-            log_file.write(f"XML is valid according to schema {schema_path}\n")
-            return True
+        schema.assertValid(tree)
+        log_file.write(f"XML is valid according to schema {schema_path}\n")
+        return True
     except etree.DocumentInvalid as e:
         log_file.write(f"XML validation failed: {str(e)}\n")
         return False
 
-def parse_and_modify_xml(file_path, mappings, log_file, namespaces=None, handle_cdata=False):
+def compile_mappings(mappings, namespaces=None):
     """
-    Parse an XML file and modify it according to the given mappings using lxml.
+    Compile each mapping's XPath expressions once so they can be reused for every file.
+    
+    A mapping either gives a literal "xpath", or an "xpath_template" using XPath variables
+    (e.g. "//DOC_HDR[@TYPE=$doc_type]") plus the "bindings" to evaluate it with. Each distinct
+    expression is compiled only once, so many mappings that differ only in their bindings
+    share one compiled XPath, and binding values never need quoting or escaping.
     
     Parameters:
-    file_path (str): The path to the XML file to be processed.
     mappings (list): A list of mapping rules from the config file.
-    log_file (file): The log file to write details about the process.
     namespaces (dict): A dictionary of namespaces, if needed.
+
+    Returns:
+    list: One (xpath, find_nodes, bindings, current_value, new_value) tuple per mapping, where
+          find_nodes is the compiled etree.XPath object for the mapping, bindings holds the
+          XPath variable values to call it with, and xpath is the label used in the logs.
+    """
+    compiled_xpaths = {}
+    compiled_mappings = []
+    for mapping in mappings:
+        if 'xpath_template' in mapping:
+            expression = mapping['xpath_template']
+            bindings = mapping.get('bindings', {})
+            xpath = f"{expression} {json.dumps(bindings)}" if bindings else expression
+        else:
+            expression = xpath = mapping['xpath']
+            bindings = {}
+        find_nodes = compiled_xpaths.get(expression)
+        if find_nodes is None:
+            find_nodes = compiled_xpaths[expression] = etree.XPath(expression, namespaces=namespaces)
+        current_value = mapping['current_value']
+        new_value = mapping.get('new_value', current_value)  # Default new_value to current_value if not provided
+        compiled_mappings.append((xpath, find_nodes, bindings, current_value, new_value))
+    return compiled_mappings
+
+def modify_cdata(node, xpath, current_value, new_value, log_file):
+    """
+    Replace the content of a CDATA section matched by a mapping. Takes the same parameters as modify_element.
+
+    Returns:
+    bool: Whether the node was modified.
+    """
+    log_file.write(f"Modifying CDATA section in {xpath}: {current_value} -> {new_value}\n")
+    node.text = etree.CDATA(new_value)
+    return True
+
+def modify_element(node, xpath, current_value, new_value, log_file):
+    """
+    Replace the text of an element matched by a mapping if it holds the expected current value.
+    
+    Parameters:
+    node (Element): The element returned by the mapping's XPath.
+    xpath (str): The mapping's label, for the log messages.
+    current_value (str): The value the element is expected to hold.
+    new_value (str): The value to replace it with.
+    log_file (file): The log file to write details about the process.
+
+    Returns:
+    bool: Whether the node was modified.
+    """
+    if node.text == current_value:
+        log_file.write(f"Modifying element {xpath}: {current_value} -> {new_value}\n")
+        node.text = new_value
+        return True
+    if node.text == new_value:
+        log_file.write(f"No change needed for {xpath}: current value already matches new value '{new_value}'\n")
+    else:
+        log_file.write(f"Current value of element {xpath} ('{node.text}') does not match expected '{current_value}', skipping modification.\n")
+    return False
+
+def modify_text(node, xpath, current_value, new_value, log_file):
+    """
+    Replace a text node or attribute value returned directly by a mapping's XPath. Takes the same
+    parameters as modify_element, with node being the string result.
+
+    Returns:
+    bool: Whether the owning element was modified.
+    """
+    # lxml's string results know the element they came from, so no second XPath query is needed
+    parent_node = node.getparent() if hasattr(node, 'getparent') else None
+    if parent_node is None:
+        log_file.write(f"Result of {xpath} ('{node}') is not attached to an element, skipping modification.\n")
+    elif node == current_value:
+        log_file.write(f"Modifying text node {xpath}: {current_value} -> {new_value}\n")
+        if node.is_attribute:
+            parent_node.set(node.attrname, new_value)
+        elif node.is_tail:
+            parent_node.tail = new_value
+        else:
+            parent_node.text = new_value
+        return True
+    elif node == new_value:
+        log_file.write(f"No change needed for text node {xpath}: current value already matches new value '{new_value}'\n")
+    else:
+        log_file.write(f"Current value of text node {xpath} ('{node}') does not match expected '{current_value}', skipping modification.\n")
+    return False
+
+def resolve_handler(node_type, handle_cdata=False):
+    """
+    Pick the modify_* function for a type of XPath result.
+
+    Parameters:
+    node_type (type): The type of a node returned by a mapping's XPath.
     handle_cdata (bool): Whether to handle CDATA sections explicitly.
 
     Returns:
-    tree (ElementTree): The modified XML tree.
-    modified (bool): Whether any modifications were made to the XML file.
+    function: The handler for that type, or None if results of that type are ignored.
     """
-    parser = etree.XMLParser(recover=True)  # Recover from broken XML if configured
-    tree = etree.parse(file_path, parser)
-    root = tree.getroot()
+    if handle_cdata and issubclass(node_type, etree.CDATA):
+        return modify_cdata
+    if issubclass(node_type, etree._Element):
+        return modify_element
+    if issubclass(node_type, str):
+        return modify_text
+    return None
 
+def apply_mappings(root, compiled_mappings, log_file, handle_cdata=False, found=None):
+    """
+    Apply the mappings to the XML tree under the given root element.
+    
+    Parameters:
+    root (Element): The root element the mapping XPaths are evaluated against.
+    compiled_mappings (list): The mapping rules as returned by compile_mappings.
+    log_file (file): The log file to write details about the process.
+    handle_cdata (bool): Whether to handle CDATA sections explicitly.
+    found (set): If given, the xpath of every mapping that matched is added to it and mappings
+                 that match nothing are not logged, so the caller can report them once.
+
+    Returns:
+    bool: Whether any modifications were made.
+    """
     modified = False  # To track if any changes were made
+    # XPath results come in only a handful of types, so each type's handler is resolved once
+    # and then looked up by exact type; this still works for unions that mix elements and strings
+    handlers = {}
 
     # Iterate over all mappings to apply the specified modifications
-    for mapping in mappings:
-        xpath = mapping['xpath']
-        current_value = mapping['current_value']
-        new_value = mapping.get('new_value', current_value)  # Default new_value to current_value if not provided
-        
-        # Find the node(s) using lxml's robust XPath support with optional namespaces
-        nodes = root.xpath(xpath, namespaces=namespaces)
+    for xpath, find_nodes, bindings, current_value, new_value in compiled_mappings:
+        # Find the node(s) with the precompiled XPath (namespaces were bound when it was compiled)
+        nodes = find_nodes(root, **bindings)
 
         if nodes:
+            if found is not None:
+                found.add(xpath)
             for node in nodes:
-                # Handle CDATA sections
-                if handle_cdata and isinstance(node, etree.CDATA):
-                    log_file.write(f"Modifying CDATA section in {xpath}: {current_value} -> {new_value}\n")
-                    node.text = etree.CDATA(new_value)
+                node_type = type(node)
+                if node_type not in handlers:
+                    handlers[node_type] = resolve_handler(node_type, handle_cdata)
+                handler = handlers[node_type]
+                if handler is not None and handler(node, xpath, current_value, new_value, log_file):
                     modified = True
-                # Handle elements
-                elif isinstance(node, etree._Element):
-                    if node.text == current_value:
-                        log_file.write(f"Modifying element {xpath}: {current_value} -> {new_value}\n")
-                        node.text = new_value
-                        modified = True
-                    elif node.text == new_value:
-                        log_file.write(f"No change needed for {xpath}: current value already matches new value '{new_value}'\n")
-                    else:
-                        log_file.write(f"Current value of element {xpath} ('{node.text}') does not match expected '{current_value}', skipping modification.\n")
-                # Handle direct text results from XPath (e.g., when querying text nodes directly)
-                elif isinstance(node, str):
-                    if node == current_value:
-                        log_file.write(f"Modifying text node {xpath}: {current_value} -> {new_value}\n")
-                        parent_node = root.xpath(f"{xpath}/..")[0]  # Get the parent node to modify the text
-                        parent_node.text = new_value
-                        modified = True
-                    elif node == new_value:
-                        log_file.write(f"No change needed for text node {xpath}: current value already matches new value '{new_value}'\n")
-                    else:
-                        log_file.write(f"Current value of text node {xpath} ('{node}') does not match expected '{current_value}', skipping modification.\n")
-        else:
+        elif found is None:
             log_file.write(f"Node or attribute for {xpath} not found in the XML structure.\n")
 
+    return modified
+
+def create_parser():
+    """
+    Create the XML parser used for whole-file parsing.
+    
+    ID collection is switched off: nothing looks elements up by xml:id, and skipping the
+    ID hash table saves work on every parsed element.
+
+    Returns:
+    XMLParser: A parser that recovers from broken XML. Parsers are not thread-safe, so
+               each worker thread creates its own.
+    """
+    return etree.XMLParser(recover=True, collect_ids=False)
+
+def parse_and_modify_xml(file_path, compiled_mappings, log_file, handle_cdata=False, parser=None):
+    """
+    Parse an XML file and modify it according to the given mappings using lxml.
+    
+    Parameters:
+    file_path (str): The path to the XML file to be processed.
+    compiled_mappings (list): The mapping rules as returned by compile_mappings.
+    log_file (file): The log file to write details about the process.
+    handle_cdata (bool): Whether to handle CDATA sections explicitly.
+    parser (XMLParser): The parser to reuse, as returned by create_parser. A new one is created if omitted.
+
+    Returns:
+    tree (ElementTree): The modified XML tree.
+    modified (bool): Whether any modifications were made to the XML file.
+    """
+    if parser is None:
+        parser = create_parser()
+    tree = etree.parse(file_path, parser)
+    modified = apply_mappings(tree.getroot(), compiled_mappings, log_file, handle_cdata)
     return tree, modified
 
+def stream_and_modify_xml(file_path, output_file_path, compiled_mappings, log_file, handle_cdata=False,
+                          pretty_print=False, encoding='UTF-8'):
+    """
+    Stream an XML file with iterparse, modifying and writing one top-level element at a time.
+    
+    Only the document root and the top-level element being processed are held in memory, so
+    memory use is bounded by the largest top-level element rather than the whole file. Every
+    mapping is applied once per top-level element and must therefore target nodes inside one;
+    the root's own attributes are copied unchanged.
+    
+    Parameters:
+    file_path (str): The path to the XML file to be processed.
+    output_file_path (str): The path the modified XML is written to. It is only kept if
+                            something was modified.
+    compiled_mappings (list): The mapping rules as returned by compile_mappings.
+    log_file (file): The log file to write details about the process.
+    handle_cdata (bool): Whether to handle CDATA sections explicitly.
+    pretty_print (bool): Whether to pretty-print each written element.
+    encoding (str): The output encoding.
+
+    Returns:
+    bool: Whether any modifications were made to the XML file.
+    """
+    modified = False
+    found = set()
+    temp_file_path = output_file_path + '.tmp'
+    context = etree.iterparse(file_path, events=('start', 'end'), recover=True, collect_ids=False)
+    try:
+        _, root = next(context)  # The first event is the start of the root element
+    except (StopIteration, etree.XMLSyntaxError):
+        # Empty file, or nothing in it but a declaration and comments
+        log_file.write(f"No root element found in {file_path}, leaving it unchanged\n")
+        return False
+
+    try:
+        with etree.xmlfile(temp_file_path, encoding=encoding) as xf:
+            xf.write_declaration()
+            # Comments and processing instructions before the root element
+            for sibling in reversed(list(root.itersiblings(preceding=True))):
+                xf.write(sibling, pretty_print=pretty_print)
+            # The mappings are evaluated against a detached stand-in for the root that holds only the
+            # finished element: the real root also holds whatever iterparse has read ahead, including
+            # half-parsed elements, which must not be matched (or matched again later)
+            scratch_root = etree.Element(root.tag, dict(root.attrib), nsmap=root.nsmap)
+            with xf.element(root.tag, dict(root.attrib), nsmap=root.nsmap):
+                depth = 1
+                for event, elem in context:
+                    if event == 'start':
+                        depth += 1
+                        continue
+                    depth -= 1
+                    if depth != 1:
+                        continue
+                    # elem is a complete top-level element. Comments and processing instructions before
+                    # it have not been written yet, so they go out before being dropped.
+                    while elem.getprevious() is not None:
+                        if not isinstance(root[0].tag, str):
+                            xf.write(root[0], pretty_print=pretty_print)
+                        del root[0]
+                    # Moving elem under the scratch root also takes it out of the parsed tree
+                    scratch_root.append(elem)
+                    if apply_mappings(scratch_root, compiled_mappings, log_file, handle_cdata, found):
+                        modified = True
+                    xf.write(elem, pretty_print=pretty_print)
+                    scratch_root.remove(elem)
+                # Comments and processing instructions after the last top-level element
+                for child in root:
+                    if not isinstance(child.tag, str):
+                        xf.write(child, pretty_print=pretty_print)
+        # Comments and processing instructions after the root element; xmlfile won't write anything
+        # once the root is closed, so they are appended to the finished file
+        epilog = list(root.itersiblings())
+        if epilog:
+            with open(temp_file_path, 'ab') as f:
+                for sibling in epilog:
+                    f.write(b'\n' + etree.tostring(sibling, encoding=encoding, with_tail=False))
+    except BaseException:
+        # xmlfile may have failed before creating the file; don't let that hide the original error
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_file_path)
+        raise
+
+    # Mappings are tried on every top-level element, so the ones that never matched are reported once per file
+    for xpath, *_ in compiled_mappings:
+        if xpath not in found:
+            log_file.write(f"Node or attribute for {xpath} not found in the XML structure.\n")
+
+    # Like the non-streaming path, only keep the output when something changed
+    if modified:
+        os.replace(temp_file_path, output_file_path)
+    else:
+        os.remove(temp_file_path)
+    return modified
+
+def build_prescan_needles(mappings):
+    """
+    Build the byte strings the pre-scan looks for: every mapping's current_value.
+    
+    A file can only need changes if at least one current_value occurs in it, but that only holds
+    when the value is written literally in the file. Values that XML may escape (&, <, >, quotes)
+    or that may be encoded differently (non-ASCII) make the pre-scan unsafe, so it is disabled.
+    
+    Parameters:
+    mappings (list): A list of mapping rules from the config file.
+
+    Returns:
+    tuple: The distinct values encoded as bytes, or None if the pre-scan cannot be used.
+    """
+    needles = []
+    for mapping in mappings:
+        value = mapping['current_value']
+        if not value or not value.isascii() or any(ch in value for ch in '&<>"\''):
+            return None
+        needles.append(value.encode('ascii'))
+    return tuple(dict.fromkeys(needles))
+
+def file_may_match(file_path, needles):
+    """
+    Check whether any of the pre-scan needles occurs in the raw bytes of a file.
+    
+    The file is memory-mapped, so the search runs over the OS page cache without copying the file.
+    
+    Parameters:
+    file_path (str): The path to the XML file.
+    needles (tuple): The byte strings returned by build_prescan_needles.
+
+    Returns:
+    bool: False if none of the needles occur in the file, True otherwise.
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files can't be mapped; let the normal path deal with them
+            return True
+        with mapped:
+            return any(mapped.find(needle) != -1 for needle in needles)
+
+# Per-thread state for the worker pool; lxml XPath and XMLSchema objects must not be shared between threads
+_thread_state = threading.local()
+
+def _init_worker(mappings, namespaces, schema_path):
+    """
+    Thread pool initializer: compile the mappings and schema and create a parser once for the worker thread that runs it.
+    
+    Parameters:
+    mappings (list): A list of mapping rules from the config file.
+    namespaces (dict): A dictionary of namespaces, if needed.
+    schema_path (str): The path to the XML schema file, or None if validation is disabled.
+    """
+    _thread_state.compiled_mappings = compile_mappings(mappings, namespaces)
+    _thread_state.schema = load_schema(schema_path) if schema_path else None
+    _thread_state.parser = create_parser()
+
+def _process_one(entry, config, needles=None):
+    """
+    Parse, modify, optionally validate and save a single XML file, writing its .log file.
+    
+    Parameters:
+    entry (DirEntry): The os.scandir entry of the XML file in the input directory.
+    config (dict): The configuration dictionary loaded from config.json.
+    needles (tuple): The pre-scan needles from build_prescan_needles, or None to always parse the file.
+    """
+    filename = entry.name
+    input_file_path = entry.path
+    output_file_path = os.path.join(config['output_directory'], filename)
+    log_file_path = os.path.join(config['output_directory'], filename.replace('.xml', '.log'))
+    handle_cdata = config.get('handle_cdata', False)  # Handle CDATA sections if enabled
+    pretty_print = config.get('pretty_print', False)
+    encoding = config.get('output_format', {}).get('encoding', 'UTF-8')
+    pretty_print_max_size = config.get('pretty_print_max_size')
+
+    # Collect the log in memory and write it out in one go once the file is done
+    log_file = io.StringIO()
+    modified = False
+    try:
+        log_file.write(f"Processing file: {filename}\n")
+
+        # Indenting is the slow part of serialization, so very large files are written without it
+        if pretty_print and pretty_print_max_size is not None and entry.stat().st_size > pretty_print_max_size:
+            log_file.write(f"File is larger than pretty_print_max_size ({pretty_print_max_size} bytes), writing it without pretty-printing\n")
+            pretty_print = False
+
+        # A file none of the current values occur in cannot need changes, so don't parse it at all
+        if needles is not None and not file_may_match(input_file_path, needles):
+            log_file.write("Pre-scan found none of the mapping current values, skipping parse\n")
+            log_file.write(f"No changes made to {filename}\n")
+            return
+
+        if config.get('streaming', False):
+            # Streaming writes the output while parsing, so there is never a complete tree to validate
+            if _thread_state.schema is not None:
+                log_file.write("Schema validation is not supported in streaming mode, skipping it\n")
+            modified = stream_and_modify_xml(input_file_path, output_file_path, _thread_state.compiled_mappings,
+                                             log_file, handle_cdata, pretty_print, encoding)
+            if modified:
+                log_file.write(f"Modified XML saved to {output_file_path}\n")
+            else:
+                log_file.write(f"No changes made to {filename}\n")
+            return
+    
+        # Parse and modify the XML file using lxml
+        tree, modified = parse_and_modify_xml(input_file_path, _thread_state.compiled_mappings, log_file, handle_cdata,
+                                              _thread_state.parser)
+
+        # Validate XML if schema validation is enabled
+        if _thread_state.schema is not None:
+            schema_path = config['schema_validation']['schema_path']
+            schema_valid = validate_xml_with_schema(tree, _thread_state.schema, schema_path, log_file)
+            if not schema_valid:
+                log_file.write(f"Skipping saving of {filename} due to schema validation failure\n")
+                return
+
+        if modified:
+            # Write the modified XML to the output directory with pretty-print and optional encoding
+            tree.write(output_file_path, pretty_print=pretty_print, xml_declaration=True, encoding=encoding)
+            log_file.write(f"Modified XML saved to {output_file_path}\n")
+        else:
+            log_file.write(f"No changes made to {filename}\n")
+    finally:
+        # With log_only_on_change, files that needed no changes don't get a log file at all
+        if modified or not config.get('log_only_on_change', False):
+            with open(log_file_path, 'w') as f:
+                f.write(log_file.getvalue())
+
 def process_xml_files(config):
     """
     Process all XML files in the input directory and save modified files.
     
+    Files are independent of each other, so they are processed on a thread pool; lxml releases
+    the GIL while it parses and serializes, so the threads run those parts in parallel.
+    
     Parameters:
     config (dict): The configuration dictionary loaded from config.json.
     """
     input_dir = config['input_directory']
     output_dir = config['output_directory']
-    mappings = config['mappings']
     namespaces = config.get('namespaces', None)  # Load namespaces if provided
-    handle_cdata = config.get('handle_cdata', False)  # Handle CDATA sections if enabled
+    schema_path = None
+    if config.get('schema_validation', {}).get('enabled', False):
+        schema_path = config['schema_validation']['schema_path']
 
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
 
-    # Iterate over all XML files in the input directory
-    for filename in os.listdir(input_dir):
-        if filename.endswith('.xml'):
-            input_file_path = os.path.join(input_dir, filename)
-            output_file_path = os.path.join(output_dir, filename)
-            log_file_path = os.path.join(output_dir, filename.replace('.xml', '.log'))
-
-            # Open the log file for this XML file
-            with open(log_file_path, 'w') as log_file:
-                log_file.write(f"Processing file: {filename}\n")
-                
-                # Parse and modify the XML file using lxml
-                tree, modified = parse_and_modify_xml(input_file_path, mappings, log_file, namespaces, handle_cdata)
-
-                # Validate XML if schema validation is enabled
-                if config.get('schema_validation', {}).get('enabled', False):
-                    schema_path = config['schema_validation']['schema_path']
-                    schema_valid = validate_xml_with_schema(tree, schema_path, log_file)
-                    if not schema_valid:
-                        log_file.write(f"Skipping saving of {filename} due to schema validation failure\n")
-                        continue
+    needles = None
+    if config.get('prescan', False):
+        needles = build_prescan_needles(config['mappings'])
+        if needles is None:
+            print("Pre-scan disabled: a mapping's current_value is empty, non-ASCII or contains characters XML may escape")
+
+    # Collect all XML files in the input directory; scandir entries carry their full path and file type,
+    # so subdirectories are skipped without an extra stat call per name
+    with os.scandir(input_dir) as it:
+        entries = [entry for entry in it if entry.name.endswith('.xml') and entry.is_file()]
 
-                if modified:
-                    # Write the modified XML to the output directory with pretty-print and optional encoding
-                    tree.write(output_file_path, pretty_print=config.get('pretty_print', False), 
-                               xml_declaration=True, encoding=config.get('output_format', {}).get('encoding', 'UTF-8'))
-                    log_file.write(f"Modified XML saved to {output_file_path}\n")
-                else:
-                    log_file.write(f"No changes made to {filename}\n")
+    # Each worker thread compiles the XPath expressions and the schema once, when it starts, and reuses
+    # them for every file it processes
+    with ThreadPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker,
+                            initargs=(config['mappings'], namespaces, schema_path)) as executor:
+        # list() drains the results so an exception raised for any file is re-raised here
+        list(executor.map(partial(_process_one, config=config, needles=needles), entries))
 
 if __name__ == "__main__":
     """